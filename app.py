@@ -5,33 +5,48 @@ A prompt-driven email agent using Google Gemini AI
 import streamlit as st
 import os
 import sys
+import json
+import math
 from datetime import datetime
-from dotenv import load_dotenv
 
 # Add the parent directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Import custom modules with error handling
+def show_import_error(error, files):
+    """Report a failed import of the app's own modules and where they should live"""
+    entries = ["__init__.py (can be empty)"] + files
+    tree = "\n".join(
+        f"    {'└──' if i == len(entries) - 1 else '├──'} {entry}"
+        for i, entry in enumerate(entries)
+    )
+    st.error(f"Import Error: {error}")
+    st.error("Please make sure all files are in the correct directories:")
+    st.code(f"\n    src/\n{tree}\n    ")
+
+# Import custom modules with error handling. The Gemini-backed modules
+# (llm_handler, email_processor, semantic_cache) are imported lazily in
+# their factories below so the landing page doesn't pay for the Google SDK;
+# their import errors are reported by the session init code instead.
 try:
     from src.storage import Storage
-    from src.llm_handler import LLMHandler
-    from src.email_processor import EmailProcessor
     from src.prompt_manager import PromptManager
+    from src.response_cache import ResponseCache
 except ImportError as e:
-    st.error(f"Import Error: {e}")
-    st.error("Please make sure all files are in the correct directories:")
-    st.code("""
-    src/
-    ├── __init__.py (can be empty)
-    ├── storage.py
-    ├── llm_handler.py
-    ├── email_processor.py
-    └── prompt_manager.py
-    """)
+    show_import_error(e, ["storage.py", "prompt_manager.py", "response_cache.py"])
     st.stop()
 
-# Load environment variables
-load_dotenv()
+# Modules imported lazily by init_ai_stack
+AI_STACK_FILES = ["llm_handler.py", "email_processor.py", "semantic_cache.py"]
+
+# Number of emails rendered per Inbox Viewer page
+EMAILS_PER_PAGE = 20
+
+# Categories the categorization prompt can assign
+EMAIL_CATEGORIES = ["Important", "Newsletter", "Spam", "To-Do", "Update"]
+
+# Marker shown next to each action item, by priority
+PRIORITY_EMOJI = {"High": "🔴", "Medium": "🟡", "Low": "🟢"}
+
 
 # Page configuration
 st.set_page_config(
@@ -70,35 +85,230 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Cached data loaders
+def _file_mtime(path):
+    """Modification time of a data file, or None if it does not exist"""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _load_json_cached(_loader, path, mtime):
+    """Run a Storage loader once per (path, mtime) pair"""
+    return _loader()
+
+def load_inbox():
+    """Load the inbox, re-reading the file only when it has changed"""
+    storage = st.session_state.storage
+    return _load_json_cached(storage.load_inbox, storage.inbox_file, _file_mtime(storage.inbox_file))
+
+def load_processed_emails():
+    """Load processed email data, re-reading the file only when it has changed"""
+    storage = st.session_state.storage
+    return _load_json_cached(storage.load_processed_emails, storage.processed_file, _file_mtime(storage.processed_file))
+
+def load_drafts():
+    """Load drafts, re-reading the file only when it has changed"""
+    storage = st.session_state.storage
+    return _load_json_cached(storage.load_drafts, storage.drafts_file, _file_mtime(storage.drafts_file))
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _build_search_index(path, mtime):
+    """Lowercase subjects and senders once per inbox version"""
+    return [
+        (e.get('id'), e.get('subject', '').lower(), e.get('sender', '').lower())
+        for e in load_inbox()
+    ]
+
+def search_index():
+    """(id, subject, sender) tuples, lowercased, for the inbox search box"""
+    storage = st.session_state.storage
+    return _build_search_index(storage.inbox_file, _file_mtime(storage.inbox_file))
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _build_category_index(inbox_mtime, processed_mtime):
+    """Group inbox email ids by their processed category"""
+    processed = load_processed_emails()
+    index = {}
+    for e in load_inbox():
+        category = processed.get(e.get('id'), {}).get('category')
+        if category:
+            index.setdefault(category, []).append(e.get('id'))
+    return index
+
+def category_index():
+    """Email ids grouped by category, rebuilt only when the inbox or processed data changes"""
+    storage = st.session_state.storage
+    return _build_category_index(
+        _file_mtime(storage.inbox_file),
+        _file_mtime(storage.processed_file)
+    )
+
+def emails_in_category(emails, category):
+    """The emails from an already-loaded inbox list that are in the category"""
+    ids = set(category_index().get(category, []))
+    return [e for e in emails if e.get('id') in ids]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _compute_quick_stats(_email_processor, inbox_mtime, processed_mtime, drafts_mtime):
+    """Counts shown in the sidebar: (emails, processed, drafts, action items)"""
+    return (
+        len(load_inbox()),
+        len(load_processed_emails()),
+        len(load_drafts()),
+        len(_email_processor.get_all_action_items())
+    )
+
+def quick_stats():
+    """Sidebar counts, recomputed only when a data file changes"""
+    storage = st.session_state.storage
+    return _compute_quick_stats(
+        st.session_state.email_processor,
+        _file_mtime(storage.inbox_file),
+        _file_mtime(storage.processed_file),
+        _file_mtime(storage.drafts_file)
+    )
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _build_chat_options(path, mtime):
+    """Chat context selectbox labels plus a label -> email id lookup"""
+    options = ["General Questions"]
+    option_ids = {}
+    for e in load_inbox():
+        label = f"{e.get('subject')} - {e.get('sender')}"
+        options.append(label)
+        option_ids.setdefault(label, e.get('id'))
+    return options, option_ids
+
+def chat_options():
+    """Chat selectbox options, rebuilt only when the inbox changes"""
+    storage = st.session_state.storage
+    return _build_chat_options(storage.inbox_file, _file_mtime(storage.inbox_file))
+
+def invalidate_data_cache():
+    """Drop cached file contents after a write (mtime may not tick on fast writes)"""
+    _load_json_cached.clear()
+    _build_search_index.clear()
+    _build_category_index.clear()
+    _compute_quick_stats.clear()
+    _build_chat_options.clear()
+
+# Shared resources (one instance per server process)
+@st.cache_resource
+def get_storage():
+    """Storage shared by all sessions"""
+    return Storage()
+
+@st.cache_resource
+def get_llm(api_key):
+    """Gemini client shared by all sessions using the same API key"""
+    from src.llm_handler import LLMHandler
+    return LLMHandler(api_key)
+
+@st.cache_resource
+def get_prompt_manager():
+    """Prompt manager shared by all sessions"""
+    return PromptManager(get_storage())
+
+@st.cache_resource
+def get_email_processor(api_key):
+    """Email processor shared by all sessions using the same API key"""
+    from src.email_processor import EmailProcessor
+    return EmailProcessor(get_llm(api_key), get_storage())
+
+@st.cache_resource
+def get_semantic_cache():
+    """Chat response cache matched by embeddings, one per process for all API keys"""
+    from src.semantic_cache import SemanticCache
+    return SemanticCache()
+
+@st.cache_resource
+def get_embedder(api_key):
+    """Query embedding function with its own client, so keys never share global config"""
+    import google.ai.generativelanguage as glm
+    client = glm.GenerativeServiceClient(client_options={"api_key": api_key})
+    
+    def embed(text):
+        response = client.embed_content(glm.EmbedContentRequest(
+            model="models/embedding-001",
+            content=glm.Content(parts=[glm.Part(text=text)]),
+            task_type=glm.TaskType.SEMANTIC_SIMILARITY
+        ))
+        return response.embedding.values
+    
+    return embed
+
+@st.cache_resource
+def get_response_cache():
+    """On-disk cache of processing results shared by all sessions"""
+    return ResponseCache()
+
+def response_cache_key(email, prompts):
+    """Cache key covering the email content and every prompt applied to it"""
+    return ResponseCache.make_key(
+        json.dumps(email, sort_keys=True),
+        json.dumps(prompts, sort_keys=True)
+    )
+
+def cacheable_result(returned, before, email_id):
+    """The record a processing call just produced, or None if it may be stale or a failure"""
+    if isinstance(returned, dict):
+        result = returned
+    else:
+        # Processor didn't hand back its record; only trust storage if the call changed it
+        result = st.session_state.storage.get_processed_email(email_id)
+        if result == before:
+            return None
+    
+    if not isinstance(result, dict) or result.get('error'):
+        return None
+    if result.get('category') not in EMAIL_CATEGORIES:
+        return None
+    return result
+
+def init_ai_stack(api_key):
+    """Attach the Gemini-backed objects for this API key to the session"""
+    st.session_state.llm = get_llm(api_key)
+    st.session_state.prompt_manager = get_prompt_manager()
+    st.session_state.email_processor = get_email_processor(api_key)
+    st.session_state.semantic_cache = get_semantic_cache()
+    st.session_state.embedder = get_embedder(api_key)
+    st.session_state.api_key_set = True
+
 # Initialize session state
 def initialize_session_state():
     """Initialize all session state variables"""
     if 'initialized' not in st.session_state:
         st.session_state.initialized = True
-        st.session_state.storage = Storage()
+        st.session_state.storage = get_storage()
         st.session_state.selected_email = None
         st.session_state.current_tab = "Inbox"
         st.session_state.chat_history = []
+        st.session_state.open_draft = None
         st.session_state.processing_complete = False
         st.session_state.api_key_set = False
         
-        # Try to initialize LLM
+        # Load environment variables and try to initialize LLM
+        from dotenv import load_dotenv
+        load_dotenv()
         api_key = os.getenv("GEMINI_API_KEY")
         if api_key:
             try:
-                st.session_state.llm = LLMHandler(api_key)
-                st.session_state.prompt_manager = PromptManager(st.session_state.storage)
-                st.session_state.email_processor = EmailProcessor(
-                    st.session_state.llm, 
-                    st.session_state.storage
-                )
-                st.session_state.api_key_set = True
+                init_ai_stack(api_key)
+            except ImportError as e:
+                st.session_state.import_error = str(e)
             except Exception as e:
                 st.session_state.api_key_set = False
                 st.session_state.api_error = str(e)
 
 initialize_session_state()
 
+# A missing or broken Gemini-backed module stops the app, as a top-level import error does
+if st.session_state.get('import_error'):
+    show_import_error(st.session_state.import_error, AI_STACK_FILES)
+    st.stop()
+
 # Main title
 st.title("📧 Email Productivity Agent")
 st.markdown("*Powered by Google Gemini AI*")
@@ -110,6 +320,8 @@ with st.sidebar:
     # API Key Input
     if not st.session_state.api_key_set:
         st.warning("⚠️ Please enter your Gemini API Key")
+        if st.session_state.get('api_error'):
+            st.error(f"❌ Error with GEMINI_API_KEY from the environment: {st.session_state.api_error}")
         api_key_input = st.text_input(
             "Gemini API Key", 
             type="password",
@@ -119,15 +331,12 @@ with st.sidebar:
         if st.button("Set API Key", type="primary"):
             if api_key_input:
                 try:
-                    st.session_state.llm = LLMHandler(api_key_input)
-                    st.session_state.prompt_manager = PromptManager(st.session_state.storage)
-                    st.session_state.email_processor = EmailProcessor(
-                        st.session_state.llm,
-                        st.session_state.storage
-                    )
-                    st.session_state.api_key_set = True
+                    init_ai_stack(api_key_input)
+                    st.session_state.api_error = None
                     st.success("✅ API Key set successfully!")
                     st.rerun()
+                except ImportError as e:
+                    show_import_error(e, AI_STACK_FILES)
                 except Exception as e:
                     st.error(f"❌ Error: {str(e)}")
             else:
@@ -153,21 +362,19 @@ with st.sidebar:
     # Quick Stats
     if st.session_state.api_key_set:
         st.header("📊 Quick Stats")
-        emails = st.session_state.storage.load_inbox()
-        processed = st.session_state.storage.load_processed_emails()
-        drafts = st.session_state.storage.load_drafts()
+        email_count, processed_count, draft_count, action_item_count = quick_stats()
         
         col1, col2 = st.columns(2)
         with col1:
-            st.metric("Total Emails", len(emails))
-            st.metric("Drafts", len(drafts))
+            st.metric("Total Emails", email_count)
+            st.metric("Drafts", draft_count)
         with col2:
-            st.metric("Processed", len(processed))
-            action_items = st.session_state.email_processor.get_all_action_items()
-            st.metric("Action Items", len(action_items))
+            st.metric("Processed", processed_count)
+            st.metric("Action Items", action_item_count)
 
-# Main content area
-if not st.session_state.api_key_set:
+# Main content views
+def render_landing():
+    """Getting-started page shown until an API key is set"""
     st.info("👈 Please set your Gemini API Key in the sidebar to get started")
     st.markdown("""
     ### Getting Started
@@ -184,7 +391,8 @@ if not st.session_state.api_key_set:
     - 🧠 **Custom Prompts**: Customize AI behavior
     """)
 
-elif nav_option == "📥 Inbox Viewer":
+def render_inbox():
+    """Inbox Viewer: process, filter and act on emails"""
     st.header("📥 Inbox Viewer")
     
     # Load and Process Emails button
@@ -192,14 +400,36 @@ elif nav_option == "📥 Inbox Viewer":
     with col1:
         if st.button("🔄 Process All Emails", type="primary", use_container_width=True):
             with st.spinner("Processing emails..."):
-                emails = st.session_state.storage.load_inbox()
+                emails = load_inbox()
                 prompts = st.session_state.prompt_manager.get_all_prompts()
                 
+                response_cache = get_response_cache()
+                cached_results = {}
+                
                 progress_bar = st.progress(0)
                 for i, email in enumerate(emails):
-                    st.session_state.email_processor.process_single_email(email, prompts)
+                    cache_key = response_cache_key(email, prompts)
+                    cached = response_cache.get(cache_key)
+                    if cached is not None:
+                        # Same email and prompts as before - skip the Gemini calls
+                        cached_results[email['id']] = cached
+                    else:
+                        before = st.session_state.storage.get_processed_email(email['id'])
+                        returned = st.session_state.email_processor.process_single_email(email, prompts)
+                        result = cacheable_result(returned, before, email['id'])
+                        if result:
+                            response_cache.set(cache_key, result)
                     progress_bar.progress((i + 1) / len(emails))
                 
+                if cached_results:
+                    processed = st.session_state.storage.load_processed_emails()
+                    processed.update(cached_results)
+                    st.session_state.storage.save_json(
+                        st.session_state.storage.processed_file,
+                        processed
+                    )
+                invalidate_data_cache()
+                
                 st.session_state.processing_complete = True
                 st.success(f"✅ Processed {len(emails)} emails!")
                 st.rerun()
@@ -214,6 +444,8 @@ elif nav_option == "📥 Inbox Viewer":
                 st.session_state.storage.processed_file, 
                 {}
             )
+            get_response_cache().clear()
+            invalidate_data_cache()
             st.success("Cleared processed data")
             st.rerun()
     
@@ -224,38 +456,53 @@ elif nav_option == "📥 Inbox Viewer":
     with col1:
         category_filter = st.selectbox(
             "Filter by Category",
-            ["All", "Important", "Newsletter", "Spam", "To-Do", "Update"]
+            ["All"] + EMAIL_CATEGORIES
         )
     
     with col2:
         search_term = st.text_input("🔎 Search", placeholder="Search subject or sender...")
     
     # Display emails
-    emails = st.session_state.storage.load_inbox()
-    processed_emails = st.session_state.storage.load_processed_emails()
+    emails = load_inbox()
+    processed_emails = load_processed_emails()
     
     # Apply filters
     filtered_emails = emails
     if category_filter != "All":
-        filtered_emails = [
-            e for e in emails 
-            if processed_emails.get(e['id'], {}).get('category') == category_filter
-        ]
+        filtered_emails = emails_in_category(emails, category_filter)
     
     if search_term:
-        filtered_emails = [
-            e for e in filtered_emails
-            if search_term.lower() in e.get('subject', '').lower() or
-               search_term.lower() in e.get('sender', '').lower()
-        ]
-    
-    st.markdown(f"**Showing {len(filtered_emails)} emails**")
+        term = search_term.lower()
+        matching_ids = {
+            email_id for email_id, subject, sender in search_index()
+            if term in subject or term in sender
+        }
+        filtered_emails = [e for e in filtered_emails if e.get('id') in matching_ids]
+    
+    # Paginate so only one page of expanders is sent to the browser
+    total_pages = max(1, math.ceil(len(filtered_emails) / EMAILS_PER_PAGE))
+    page = 1
+    if total_pages > 1:
+        page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, step=1)
+    page_start = (page - 1) * EMAILS_PER_PAGE
+    page_emails = filtered_emails[page_start:page_start + EMAILS_PER_PAGE]
+    
+    if total_pages > 1:
+        st.markdown(
+            f"**Showing {page_start + 1}-{page_start + len(page_emails)} "
+            f"of {len(filtered_emails)} emails** (page {page} of {total_pages})"
+        )
+    else:
+        st.markdown(f"**Showing {len(filtered_emails)} emails**")
     
-    # Display each email
-    for email in filtered_emails:
+    # Display each email on the current page
+    for email in page_emails:
         email_id = email.get('id')
         processed = processed_emails.get(email_id, {})
         category = processed.get('category', 'Unprocessed')
+        summary = processed.get('summary')
+        action_items = processed.get('action_items', {}).get('tasks', [])
+        reply = processed.get('suggested_reply')
         
         with st.expander(f"📧 **{email.get('subject')}** - From: {email.get('sender')}"):
             col1, col2 = st.columns([3, 1])
@@ -273,23 +520,21 @@ elif nav_option == "📥 Inbox Viewer":
                 st.text(email.get('body', 'No content'))
                 
                 # Summary
-                if processed.get('summary'):
+                if summary:
                     st.markdown("**📝 Summary:**")
-                    st.info(processed['summary'])
+                    st.info(summary)
                 
                 # Action items
-                action_items = processed.get('action_items', {}).get('tasks', [])
                 if action_items:
                     st.markdown("**✅ Action Items:**")
                     for task in action_items:
-                        priority_emoji = {"High": "🔴", "Medium": "🟡", "Low": "🟢"}.get(task.get('priority', 'Low'), "⚪")
+                        priority_emoji = PRIORITY_EMOJI.get(task.get('priority', 'Low'), "⚪")
                         st.markdown(f"{priority_emoji} **{task.get('task')}**")
                         st.caption(f"Deadline: {task.get('deadline', 'Not specified')}")
                 
                 # Suggested reply
-                if processed.get('suggested_reply'):
+                if reply:
                     st.markdown("**💬 Suggested Reply:**")
-                    reply = processed['suggested_reply']
                     st.code(f"Subject: {reply.get('subject', '')}\n\n{reply.get('body', '')}")
             
             with col2:
@@ -299,26 +544,33 @@ elif nav_option == "📥 Inbox Viewer":
                     st.rerun()
                 
                 if st.button("✉️ Draft Reply", key=f"draft_{email_id}"):
-                    if processed.get('suggested_reply'):
+                    if reply:
                         draft = {
                             'id': f"draft_{email_id}",
                             'to': email.get('sender'),
-                            'subject': processed['suggested_reply'].get('subject'),
-                            'body': processed['suggested_reply'].get('body'),
+                            'subject': reply.get('subject'),
+                            'body': reply.get('body'),
                             'reply_to': email_id,
                             'created_at': datetime.now().isoformat()
                         }
                         st.session_state.storage.save_draft(draft)
+                        invalidate_data_cache()
                         st.success("Draft saved!")
                 
                 if st.button("🔄 Reprocess", key=f"reprocess_{email_id}"):
                     with st.spinner("Reprocessing..."):
                         prompts = st.session_state.prompt_manager.get_all_prompts()
-                        st.session_state.email_processor.reprocess_email(email_id, prompts)
+                        before = st.session_state.storage.get_processed_email(email_id)
+                        returned = st.session_state.email_processor.reprocess_email(email_id, prompts)
+                        result = cacheable_result(returned, before, email_id)
+                        if result:
+                            get_response_cache().set(response_cache_key(email, prompts), result)
+                        invalidate_data_cache()
                     st.success("Reprocessed!")
                     st.rerun()
 
-elif nav_option == "🧠 Prompt Manager":
+def render_prompts():
+    """Prompt Manager: edit the prompts used for processing"""
     st.header("🧠 Prompt Manager")
     
     st.markdown("""
@@ -407,17 +659,14 @@ elif nav_option == "🧠 Prompt Manager":
             st.success("✅ All prompts reset to defaults!")
             st.rerun()
 
-elif nav_option == "💬 Email Agent Chat":
+def render_chat():
+    """Email Agent Chat: ask questions about the inbox"""
     st.header("💬 Email Agent Chat")
     
     st.markdown("Ask questions about your emails or request actions")
     
     # Email selector
-    emails = st.session_state.storage.load_inbox()
-    email_options = ["General Questions"] + [
-        f"{e.get('subject')} - {e.get('sender')}" 
-        for e in emails
-    ]
+    email_options, email_option_ids = chat_options()
     
     selected_email_display = st.selectbox(
         "Select Email Context (optional)",
@@ -426,10 +675,7 @@ elif nav_option == "💬 Email Agent Chat":
     )
     
     # Get selected email ID
-    selected_email_id = None
-    if selected_email_display != "General Questions":
-        selected_index = email_options.index(selected_email_display) - 1
-        selected_email_id = emails[selected_index].get('id')
+    selected_email_id = email_option_ids.get(selected_email_display)
     
     # Chat interface
     st.subheader("Chat History")
@@ -438,11 +684,8 @@ elif nav_option == "💬 Email Agent Chat":
     chat_container = st.container()
     with chat_container:
         for message in st.session_state.chat_history:
-            if message['role'] == 'user':
-                st.markdown(f"**You:** {message['content']}")
-            else:
-                st.markdown(f"**Agent:** {message['content']}")
-            st.divider()
+            with st.chat_message("user" if message['role'] == 'user' else "assistant"):
+                st.markdown(message['content'])
     
     # Chat input
     user_query = st.text_input("Ask a question or request an action:", key="chat_input")
@@ -463,9 +706,15 @@ elif nav_option == "💬 Email Agent Chat":
                     context['email'] = st.session_state.storage.get_email_by_id(selected_email_id)
                     context['processed_data'] = st.session_state.storage.get_processed_email(selected_email_id)
                 
-                # Get response from LLM
+                # Reuse the answer to an equivalent earlier question, else ask the LLM
+                semantic_cache = st.session_state.semantic_cache
+                context_hash = semantic_cache.context_hash(context)
                 with st.spinner("Thinking..."):
-                    response = st.session_state.llm.chat_with_context(user_query, context)
+                    query_embedding = semantic_cache.embed(user_query, st.session_state.embedder)
+                    response = semantic_cache.lookup(query_embedding, context_hash)
+                    if response is None:
+                        response = st.session_state.llm.chat_with_context(user_query, context)
+                        semantic_cache.add(user_query, query_embedding, context_hash, response)
                 
                 # Add agent response to history
                 st.session_state.chat_history.append({
@@ -497,7 +746,7 @@ elif nav_option == "💬 Email Agent Chat":
     
     with col2:
         if st.button("🔴 Show Important"):
-            important = st.session_state.email_processor.get_emails_by_category('Important')
+            important = emails_in_category(load_inbox(), 'Important')
             if important:
                 st.markdown(f"### {len(important)} Important Emails")
                 for email in important:
@@ -507,7 +756,7 @@ elif nav_option == "💬 Email Agent Chat":
     
     with col3:
         if st.button("📋 Show To-Do"):
-            todos = st.session_state.email_processor.get_emails_by_category('To-Do')
+            todos = emails_in_category(load_inbox(), 'To-Do')
             if todos:
                 st.markdown(f"### {len(todos)} To-Do Emails")
                 for email in todos:
@@ -515,11 +764,12 @@ elif nav_option == "💬 Email Agent Chat":
             else:
                 st.info("No to-do emails")
 
-elif nav_option == "✉️ Draft Manager":
+def render_drafts():
+    """Draft Manager: create, edit and delete drafts"""
     st.header("✉️ Draft Manager")
     
     # Load drafts
-    drafts = st.session_state.storage.load_drafts()
+    drafts = load_drafts()
     
     st.markdown(f"**{len(drafts)} draft(s) saved**")
     
@@ -538,6 +788,7 @@ elif nav_option == "✉️ Draft Manager":
                     'created_at': datetime.now().isoformat()
                 }
                 st.session_state.storage.save_draft(draft)
+                invalidate_data_cache()
                 st.success("✅ Draft saved!")
                 st.rerun()
             else:
@@ -545,10 +796,22 @@ elif nav_option == "✉️ Draft Manager":
     
     st.divider()
     
+    # Forget an open draft that no longer exists (e.g. deleted from another session)
+    draft_ids = {draft.get('id') for draft in drafts if draft.get('id') is not None}
+    if st.session_state.get('open_draft') not in draft_ids:
+        st.session_state.open_draft = None
+    open_draft = st.session_state.open_draft
+    
     # Display existing drafts
     if drafts:
         for draft in drafts:
-            with st.expander(f"✉️ {draft.get('subject', 'No subject')} → {draft.get('to', 'Unknown')}"):
+            draft_id = draft.get('id')
+            is_open = draft_id is not None and draft_id == open_draft
+            
+            with st.expander(
+                f"✉️ {draft.get('subject', 'No subject')} → {draft.get('to', 'Unknown')}",
+                expanded=is_open
+            ):
                 st.markdown(f"**To:** {draft.get('to', 'Unknown')}")
                 st.markdown(f"**Subject:** {draft.get('subject', 'No subject')}")
                 st.markdown(f"**Created:** {draft.get('created_at', 'Unknown')}")
@@ -557,32 +820,70 @@ elif nav_option == "✉️ Draft Manager":
                     st.caption(f"↩️ Reply to email: {draft.get('reply_to')}")
                 
                 st.markdown("**Body:**")
+                
+                # Only the draft being edited gets the editor widgets
+                if not is_open:
+                    st.text(draft.get('body', ''))
+                    # One editor at a time, so unsaved edits are never dropped silently
+                    if draft_id is not None and st.button(
+                        "✏️ Edit",
+                        key=f"open_{draft_id}",
+                        disabled=open_draft is not None
+                    ):
+                        st.session_state.open_draft = draft_id
+                        st.rerun()
+                    continue
+                
                 edited_body = st.text_area(
                     "Edit draft:", 
                     value=draft.get('body', ''),
                     height=200,
-                    key=f"edit_{draft.get('id')}"
+                    key=f"edit_{draft_id}"
                 )
                 
-                col1, col2, col3 = st.columns(3)
+                col1, col2, col3, col4 = st.columns(4)
                 
                 with col1:
-                    if st.button("💾 Update", key=f"update_{draft.get('id')}"):
+                    if st.button("💾 Update", key=f"update_{draft_id}"):
                         draft['body'] = edited_body
                         st.session_state.storage.save_draft(draft)
+                        invalidate_data_cache()
+                        st.session_state.open_draft = None
                         st.success("Draft updated!")
+                        st.rerun()
                 
                 with col2:
-                    st.info("⚠️ Drafts are not sent automatically")
+                    if st.button("✖️ Cancel", key=f"cancel_{draft_id}"):
+                        st.session_state.pop(f"edit_{draft_id}", None)
+                        st.session_state.open_draft = None
+                        st.rerun()
                 
                 with col3:
-                    if st.button("🗑️ Delete", key=f"delete_{draft.get('id')}"):
-                        st.session_state.storage.delete_draft(draft.get('id'))
+                    st.info("⚠️ Drafts are not sent automatically")
+                
+                with col4:
+                    if st.button("🗑️ Delete", key=f"delete_{draft_id}"):
+                        st.session_state.storage.delete_draft(draft_id)
+                        invalidate_data_cache()
+                        st.session_state.open_draft = None
                         st.success("Draft deleted!")
                         st.rerun()
     else:
         st.info("No drafts yet. Process emails or create a new draft above!")
 
+VIEWS = {
+    "📥 Inbox Viewer": render_inbox,
+    "🧠 Prompt Manager": render_prompts,
+    "💬 Email Agent Chat": render_chat,
+    "✉️ Draft Manager": render_drafts
+}
+
+# Main content area
+if not st.session_state.api_key_set:
+    render_landing()
+else:
+    VIEWS.get(nav_option, render_landing)()
+
 # Footer
 st.divider()
 st.caption("Email Productivity Agent | Powered by Google Gemini AI | Made with ❤️ using Streamlit")
@@ -0,0 +1,54 @@
+"""
+Response Cache - persists LLM results on disk keyed by a hash of their inputs
+"""
+import hashlib
+import json
+import os
+from typing import Any, Optional
+
+
+class ResponseCache:
+    """JSON-on-disk cache for LLM responses"""
+
+    def __init__(self, cache_dir: str = "data/llm_cache"):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a cache key from the text that determines a response"""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached response, or None on a miss"""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def set(self, key: str, value: Any) -> bool:
+        """Store a response under the given key"""
+        try:
+            with open(self._path(key), "w", encoding="utf-8") as f:
+                json.dump(value, f, indent=2)
+            return True
+        except (OSError, TypeError):
+            return False
+
+    def clear(self) -> bool:
+        """Remove all cached responses"""
+        try:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.cache_dir, name))
+            return True
+        except OSError:
+            return False
@@ -0,0 +1,137 @@
+"""
+Semantic Cache - reuses chat answers for queries that mean the same thing
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+
+class SemanticCache:
+    """Caches chat responses and matches new queries by embedding similarity
+
+    Entries are stored append-only: metadata as JSON lines in
+    ``{cache_path}.jsonl`` and embeddings as raw float32 rows in
+    ``{cache_path}.f32``. The files are compacted to the newest
+    ``max_entries`` once they grow to twice that size.
+    """
+
+    def __init__(
+        self,
+        cache_path: str = "data/chat_cache",
+        threshold: float = 0.95,
+        max_entries: int = 500
+    ):
+        self.meta_file = f"{cache_path}.jsonl"
+        self.embedding_file = f"{cache_path}.f32"
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: List[Dict[str, Any]] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._stored = 0  # entries currently on disk, including ones trimmed from memory
+        self._load()
+
+    @staticmethod
+    def context_hash(context: Dict[str, Any]) -> str:
+        """Hash of the chat context; answers are only reused within the same context"""
+        payload = json.dumps(context, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def embed(query: str, embed_fn: Callable[[str], List[float]]) -> Optional[np.ndarray]:
+        """Get the unit-length embedding of a query, or None if embedding fails"""
+        try:
+            vector = np.asarray(embed_fn(query), dtype=np.float32)
+        except Exception:
+            return None
+
+        norm = np.linalg.norm(vector)
+        if vector.ndim != 1 or norm == 0:
+            return None
+        return vector / norm
+
+    def lookup(self, embedding: Optional[np.ndarray], context_hash: str) -> Optional[str]:
+        """Get the cached response closest to the embedding, if similar enough"""
+        if embedding is None:
+            return None
+
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != embedding.shape[0]:
+                return None
+
+            similarities = self._matrix @ embedding
+            for i in np.argsort(similarities)[::-1]:
+                if similarities[i] < self.threshold:
+                    break
+                if self._entries[i]["context_hash"] == context_hash:
+                    return self._entries[i]["response"]
+
+        return None
+
+    def add(self, query: str, embedding: Optional[np.ndarray], context_hash: str, response: str) -> bool:
+        """Store a response for later similar queries"""
+        if embedding is None:
+            return False
+
+        entry = {"query": query, "context_hash": context_hash, "response": response}
+        row = embedding.astype(np.float32).reshape(1, -1)
+
+        with self._lock:
+            if self._matrix is not None and self._matrix.shape[1] != row.shape[1]:
+                # Embedding model changed; older vectors can't be compared
+                self._entries, self._matrix = [], None
+                self._stored = self.max_entries * 2
+
+            self._entries.append(entry)
+            self._matrix = row if self._matrix is None else np.vstack([self._matrix, row])
+            if len(self._entries) > self.max_entries:
+                self._entries = self._entries[-self.max_entries:]
+                self._matrix = self._matrix[-self.max_entries:]
+
+            if self._stored + 1 >= self.max_entries * 2:
+                return self._rewrite()
+            return self._append(entry, row)
+
+    def _load(self):
+        try:
+            with open(self.meta_file, "r", encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+            vectors = np.fromfile(self.embedding_file, dtype=np.float32)
+        except (OSError, ValueError):
+            return
+
+        if not entries or vectors.size % len(entries):
+            return
+
+        matrix = vectors.reshape(len(entries), -1)
+        self._stored = len(entries)
+        self._entries = entries[-self.max_entries:]
+        self._matrix = matrix[-self.max_entries:]
+
+    def _append(self, entry: Dict[str, Any], row: np.ndarray) -> bool:
+        try:
+            os.makedirs(os.path.dirname(self.meta_file) or ".", exist_ok=True)
+            with open(self.meta_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            with open(self.embedding_file, "ab") as f:
+                row.tofile(f)
+            self._stored += 1
+            return True
+        except OSError:
+            return False
+
+    def _rewrite(self) -> bool:
+        try:
+            os.makedirs(os.path.dirname(self.meta_file) or ".", exist_ok=True)
+            with open(self.meta_file, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in self._entries)
+            with open(self.embedding_file, "wb") as f:
+                self._matrix.astype(np.float32).tofile(f)
+            self._stored = len(self._entries)
+            return True
+        except OSError:
+            return False